@@ -7,6 +7,8 @@ Features
 - Extract:
   * Pages through /animals/v1/animals to list IDs
   * Fetches details concurrently (bounded by --concurrency)
+  * Details stream through bounded queues into transform and load, so the
+    three stages overlap instead of running back to back
 
 - Transform:
   * friends: "a, b, c" -> ["a","b","c"]
@@ -17,9 +19,11 @@ Features
   * POSTs batches of up to 100 records to /animals/v1/home
 
 - Reliability:
-  * Retries transient 5xx + network errors with exponential backoff + jitter
+  * Retries transient 5xx + network errors with full-jitter exponential backoff
+    (honors Retry-After)
+  * Pooled keep-alive connections, HTTP/2 when the server supports it
   * Fails fast on 4xx errors
-  * Logs request IDs, retries, and warnings
+  * Logs progress to stdout and request IDs, retries, and warnings to stderr (--log-level DEBUG adds per-batch lines)
 
 Run Challenge API locally:
   docker load -i lp-programming-challenge-1-1625610904.tar.gz
@@ -35,23 +39,35 @@ Config via env:
   MAX_RETRIES (default 6)
   CONNECT_TIMEOUT (default 5)
   READ_TIMEOUT (default 30)
+  LOG_LEVEL (default INFO)
+  CACHE_PATH (optional sqlite ETag cache for detail GETs; off by default)
 """
 from __future__ import annotations
 import argparse
 import asyncio
+import functools
+import itertools
+import logging
+import math
 import os
 import random
-import re
+import sqlite3
 import sys
-import uuid
+import threading
+import time
 
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
 import httpx
+import orjson
 
 RETRY_STATUSES = {500, 502, 503, 504}
-ISO_UTC_Z_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z$")
+# X-Request-Id = "<pid>-<seq>" (hex): unique within a run, distinguishable across processes
+_PID_TAG = f"{os.getpid():x}"
+_req_counter = itertools.count(1)
+_rng = random.Random()  # dedicated backoff RNG, independent of the global random state
+_BACKOFF_CAP = 8.0
+_RETRY_AFTER_MAX = 4 * _BACKOFF_CAP  # longest server-requested pause we honour
 
 # ------------------ CLI ------------------
 
@@ -64,63 +80,193 @@ def parse_args():
     p.add_argument("--retries", type=int, default=int(os.getenv("MAX_RETRIES", "6")))
     p.add_argument("--connect-timeout", type=float, default=float(os.getenv("CONNECT_TIMEOUT", "5")))
     p.add_argument("--read-timeout", type=float, default=float(os.getenv("READ_TIMEOUT", "30")))
+    p.add_argument("--cache-path", default=os.getenv("CACHE_PATH") or None,
+                   help="sqlite file for ETag-validated detail responses (disabled when unset)")
+    p.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO").upper(),
+                   choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     return p.parse_args()
 
+# ------------------ Logging ------------------
+
+log = logging.getLogger("animals_etl")
+
+def _configure_logging(level: str) -> None:
+    """
+    Progress lines (below WARNING) go to stdout, warnings and errors to stderr.
+    Both handlers write through immediately so a long run shows progress as it happens.
+    """
+    fmt = logging.Formatter("%(message)s")
+    progress = logging.StreamHandler(sys.stdout)
+    progress.setFormatter(fmt)
+    progress.addFilter(lambda record: record.levelno < logging.WARNING)
+    problems = logging.StreamHandler(sys.stderr)
+    problems.setFormatter(fmt)
+    problems.setLevel(logging.WARNING)
+    log.addHandler(progress)
+    log.addHandler(problems)
+    log.setLevel(level)
+    log.propagate = False
+
 # ------------------ Transform helpers ------------------
 
 def split_friends(s: Optional[str]) -> List[str]:
     """Split a comma-delimited string into a trimmed list; tolerates None/empty."""
     if not s:
         return []
-    return [p.strip() for p in s.split(",") if p.strip()]
+    # str.split + strip beats a regex scan for a fixed one-char delimiter; empty entries are dropped
+    return [t for part in s.split(",") if (t := part.strip())]
+
+# Divisor that brings each unit (s, ms, µs, ns) to seconds, indexed by the bit-length bucket
+_UNIT_DIVISORS = (1, 1_000, 1_000_000, 1_000_000_000)
+# Same buckets precomputed per bit length: s < 2**36 (~6.9e10) <= ms < 2**46 (~7.0e13) <= µs < 2**53 (~9.0e15) <= ns
+_DIV_BY_BITS = tuple(_UNIT_DIVISORS[(n > 36) + (n > 46) + (n > 53)] for n in range(128))
+
+@functools.lru_cache(maxsize=4096)
+def _civil_date(days: int) -> str:
+    """Days since 1970-01-01 -> "YYYY-MM-DDT" (Hinnant's civil_from_days, pure integer math)."""
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097                                          # [0, 146096]
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365    # [0, 399]
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)                    # [0, 365], March-based
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    mo = mp + 3 if mp < 10 else mp - 9
+    return f"{yoe + era * 400 + (mo <= 2):04d}-{mo:02d}-{d:02d}T"
+
+@functools.lru_cache(maxsize=4096)
+def _fmt(sec: int) -> str:
+    """UTC epoch seconds -> "YYYY-MM-DDTHH:MM:SS"; timestamps cluster, so formatted once per distinct second."""
+    days, rem = divmod(sec, 86400)
+    hh, rem = divmod(rem, 3600)
+    mm, ss = divmod(rem, 60)
+    return f"{_civil_date(days)}{hh:02d}:{mm:02d}:{ss:02d}"
+
+def _format_utc(sec: int, micros: int = 0) -> str:
+    """Format whole UTC epoch seconds (+ optional microseconds) as ISO8601 with 'Z'."""
+    base = _fmt(sec)
+    return f"{base}.{micros:06d}Z" if micros else f"{base}Z"
+
+@functools.lru_cache(maxsize=1 << 15)
+def _epoch_int_to_iso(e: int) -> Tuple[float, Optional[str]]:
+    """
+    Memoized core of `epoch_to_iso8601_utc` for non-negative integer epochs.
+    Returns (seconds since epoch, ISO string or None if unrepresentable).
+    """
+    # Detect units by magnitude with one table lookup (anything past 127 bits is ns anyway)
+    n = e.bit_length()
+    div = _DIV_BY_BITS[n] if n < 128 else 1_000_000_000
+    
+    if div == 1_000_000_000:
+        # ns -> µs rounded half-to-even, as datetime.fromtimestamp does, but exact (no float noise)
+        us, rem = divmod(e, 1_000)
+        if rem > 500 or (rem == 500 and us & 1):
+            us += 1
+        sec, micros = divmod(us, 1_000_000)
+    else:
+        sec, frac = divmod(e, div)
+        micros = frac * 1_000_000 // div  # exact for s/ms/µs
+    try:
+        return e / div, _format_utc(sec, micros)
+    except (OverflowError, OSError, ValueError):
+        return e / div, None
 
-def epoch_to_iso8601_utc(epoch: Optional[int | float]) -> Optional[str]:
+def epoch_to_iso8601_utc(epoch: Optional[int | float], now_ts: Optional[float] = None) -> Optional[str]:
     """
     Convert epoch to ISO8601 UTC with 'Z'.
     Auto-detect unit (s/ms/µs/ns) by magnitude.
     Returns None for invalid, negative, or future timestamps.
+    Pass `now_ts` (a `time.time()` value) once per batch to avoid reading the clock per record.
     """
     # Reject negatives and null
     if epoch is None or epoch < 0:
         return None
     
-    e = int(epoch)
-    now = datetime.now(tz=timezone.utc)
-    
-    # Detect units by magnitude
-    if e >= 10**18:          # nanoseconds
-        ts = e / 1_000_000_000.0
-    elif e >= 10**15:        # microseconds
-        ts = e / 1_000_000.0
-    elif e >= 10**12:        # milliseconds
-        ts = e / 1_000.0
-    else:                    # seconds
-        ts = float(e)
-    try:
-        dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-    except (OverflowError, OSError, ValueError):
-        return None
-    
-    # Guardrail: keep only dates until present
-    if dt <= now:
-        return dt.isoformat().replace("+00:00", "Z")
+    ts, iso = _epoch_int_to_iso(int(epoch))
     
-    return None
+    # Guardrail: keep only dates until present (checked outside the cache)
+    if now_ts is None:
+        now_ts = time.time()
+    return iso if ts <= now_ts else None
 
-def validate_iso8601_utc(z: Optional[str]) -> bool:
-    """True iff string is ISO8601 UTC with 'Z' suffix (None allowed)."""
-    if z is None:
-        return True
-    return bool(ISO_UTC_Z_RE.match(z))
+def epoch_to_iso8601_utc_batch(epochs: Iterable[Optional[int | float]], now_ts: Optional[float] = None) -> List[Optional[str]]:
+    """
+    Column-wise `epoch_to_iso8601_utc`: convert a whole born_at column in one pass.
+    Reads the clock once and binds the memoized core locally, so each row is a cache
+    lookup plus one float compare.
+    """
+    if now_ts is None:
+        now_ts = time.time()
+    convert = _epoch_int_to_iso
+    out: List[Optional[str]] = []
+    append = out.append
+    for epoch in epochs:
+        if epoch is None or epoch < 0:
+            append(None)
+            continue
+        ts, iso = convert(int(epoch))
+        append(iso if ts <= now_ts else None)
+    return out
 
 # ------------------ HTTP client (async + retries) ------------------
 
+def _retry_after_seconds(resp: Optional[httpx.Response]) -> float:
+    """
+    Delay requested by a Retry-After header (delta-seconds form), clamped to _RETRY_AFTER_MAX;
+    0 if absent, unparsable or non-finite ("inf"/"nan").
+    """
+    if resp is None:
+        return 0.0
+    try:
+        delay = float(resp.headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
+    if not math.isfinite(delay):
+        return 0.0
+    return min(max(0.0, delay), _RETRY_AFTER_MAX)
+
+class ETagCache:
+    """
+    sqlite store of detail responses keyed by path, validated with ETag.
+    A 304 Not Modified reuses the stored body, so re-runs skip the download.
+    Called from worker threads (asyncio.to_thread); a lock serializes access to the one connection.
+    """
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        # WAL keeps per-response commits cheap and survives an interrupted run
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (path TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL)"
+        )
+    
+    def get(self, path: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            return self.db.execute("SELECT etag, body FROM responses WHERE path = ?", (path,)).fetchone()
+    
+    def put(self, path: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            self.db.execute("INSERT OR REPLACE INTO responses (path, etag, body) VALUES (?, ?, ?)", (path, etag, body))
+    
+    def close(self) -> None:
+        with self._lock:
+            self.db.close()
+
 class AsyncETL:
     """
     Async HTTP client wrapper for the Animals API.
     Handles retries, backoff, logging, and concurrency.
     """
-    def __init__(self, base_url: str, connect_timeout: float, read_timeout: float, retries: int, concurrency: int):
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float,
+        read_timeout: float,
+        retries: int,
+        concurrency: int,
+        cache_path: Optional[str] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.timeout = httpx.Timeout(
             connect=connect_timeout,
@@ -128,22 +274,60 @@ class AsyncETL:
             write=read_timeout,
             pool=read_timeout,
         )
-        self.concurrency = max(1, min(32, concurrency))
+        # Semaphore and connection pool are both sized from this one number; the pool
+        # keeps 2x headroom so listing/upload requests never starve detail workers.
+        self.concurrency = max(1, concurrency)
         self.retries = retries
         self.sem = asyncio.Semaphore(self.concurrency)
+        self.limits = httpx.Limits(
+            max_connections=self.concurrency * 2,
+            max_keepalive_connections=self.concurrency,
+            keepalive_expiry=60.0,
+        )
         self.client: httpx.AsyncClient | None = None
+        self._protocol_logged = False
+        self.cache_path = cache_path
+        self.cache: ETagCache | None = None
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
     
     async def __aenter__(self):
+        # One pooled transport shared by every phase; HTTP/2 multiplexes concurrent
+        # GETs where ALPN allows it (plain http stays on HTTP/1.1 keep-alive).
+        # Retries are handled by _request, so the transport does not retry connects.
+        transport = httpx.AsyncHTTPTransport(http2=True, retries=0, limits=self.limits)
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=self.timeout,
-            headers={"Accept": "application/json"}
+            headers={"Accept": "application/json"},
+            transport=transport,
         )
+        if self.cache_path:
+            self.cache = ETagCache(self.cache_path)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
+        # Stop any fetch still in flight before its client and cache are closed
+        pending = list(self._inflight.values())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
         if self.client is not None:
             await self.client.aclose()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def warm_up(self, n: int) -> None:
+        """
+        Best-effort: open up to `n` pooled connections before the first burst (no retries, errors ignored).
+        Each GET is capped at the connect timeout so a slow listing page cannot stall start-up.
+        """
+        assert self.client is not None
+        await asyncio.gather(
+            *(self.client.get("/animals/v1/animals", params={"page": 1}, timeout=self.timeout.connect)
+              for _ in range(max(0, n))),
+            return_exceptions=True,
+        )
 
     async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
         """
@@ -153,7 +337,7 @@ class AsyncETL:
         """
         assert self.client is not None
         last_exc: Exception | None = None
-        req_id = kwargs.pop("req_id", str(uuid.uuid4()))
+        req_id = kwargs.pop("req_id", None) or f"{_PID_TAG}-{next(_req_counter):x}"
         headers = kwargs.pop("headers", {})
         headers.setdefault("X-Request-Id", req_id)
         kwargs["headers"] = headers
@@ -171,14 +355,18 @@ class AsyncETL:
                         request=resp.request, response=resp
                     )
                 
+                # 304 answers a conditional GET (If-None-Match); the caller serves its cached body
+                if status == 304 and "If-None-Match" in headers:
+                    return resp
+
                 # 422 (validation) handling: log useful details, then fail fast
                 if status == 422:
                     try:
-                        payload = resp.json()
+                        payload = orjson.loads(resp.content)
                     except ValueError:
                         payload = {"detail": (resp.text or "Unprocessable Entity")}
                     detail = payload.get("detail", payload)
-                    print(f"[req#{req_id}] 422 validation error on {method} {url}: {detail}", file=sys.stderr)
+                    log.warning("[req#%s] 422 validation error on %s %s: %s", req_id, method, url, detail)
                     resp.raise_for_status()
 
                 # Fail fast, don’t retry
@@ -188,35 +376,40 @@ class AsyncETL:
                 # Defensive: no other non-2xx should slip through
                 if not (200 <= status < 300):
                     if 500 <= status < 600 and status not in RETRY_STATUSES:
-                        print(f"[req#{req_id}] [fatal] {method} {url} returned {status}, not retrying", file=sys.stderr)
+                        log.error("[req#%s] [fatal] %s %s returned %s, not retrying", req_id, method, url, status)
                     resp.raise_for_status() 
                     
                 if attempt > 1:
-                    print(f"[req#{req_id}] succeeded after {attempt} attempt(s)", file=sys.stderr)
+                    log.info("[req#%s] succeeded after %d attempt(s)", req_id, attempt)
+                if not self._protocol_logged:
+                    self._protocol_logged = True
+                    log.debug("Connected to %s over %s", self.base_url, resp.http_version)
                 return resp
             
             except httpx.HTTPStatusError as e:
                 # If it's 4xx, do NOT retry
                 status = getattr(e.response, "status_code", None)
                 if status is not None and 400 <= status < 500:
-                    print(f"[req#{req_id}] [fatal] {method} {url} returned {status}, not retrying", file=sys.stderr)
+                    log.error("[req#%s] [fatal] %s %s returned %s, not retrying", req_id, method, url, status)
                     raise
                 last_exc = e
             except httpx.HTTPError as e:
                 last_exc = e
             
             if attempt < self.retries:
-                sleep = min(8.0, 0.5 * (2 ** (attempt - 1))) + random.uniform(0, 0.5)
+                # Full jitter: spread retries over the whole backoff window, but never
+                # come back sooner than the server asked via Retry-After
+                sleep = _rng.uniform(0, min(_BACKOFF_CAP, 0.5 * (1 << (attempt - 1))))
+                sleep = max(sleep, _retry_after_seconds(getattr(last_exc, "response", None)))
                 params = kwargs.get("params")
-                has_json = kwargs.get("json") is not None
+                has_json = kwargs.get("json") is not None or kwargs.get("content") is not None
                 err_kind = f"HTTP {getattr(getattr(last_exc, 'response', None), 'status_code', 'ERR')}" \
                        if isinstance(last_exc, httpx.HTTPStatusError) else "network"
-                print(f"[req#{req_id}] [retry {attempt}/{self.retries}] {method} {url} "
-                    f"params={params} json={has_json} failed: {err_kind}: {last_exc}. "
-                    f"Sleeping {sleep:.2f}s", file=sys.stderr)
+                log.warning("[req#%s] [retry %d/%d] %s %s params=%s json=%s failed: %s: %s. Sleeping %.2fs",
+                    req_id, attempt, self.retries, method, url, params, has_json, err_kind, last_exc, sleep)
                 await asyncio.sleep(sleep)
             else:
-                print(f"[req#{req_id}] [giving up] {method} {url}: {last_exc}", file=sys.stderr)
+                log.error("[req#%s] [giving up] %s %s: %s", req_id, method, url, last_exc)
                 raise last_exc or RuntimeError("request failed")
                 
         raise last_exc or RuntimeError("request failed")
@@ -225,88 +418,96 @@ class AsyncETL:
     async def get_animals_page(self, page: int) -> Dict[str, Any]:
         resp = await self._request("GET", "/animals/v1/animals", params={"page": page})
         try:
-            return resp.json()
+            return orjson.loads(resp.content)
         except ValueError:
-            print(f"[warn] Non-JSON for page {page}", file=sys.stderr)
+            log.warning("[warn] Non-JSON for page %s", page)
             return {"items": [], "total_pages": 1}
 
     async def get_animal(self, animal_id: int) -> Dict[str, Any]:
-        resp = await self._request("GET", f"/animals/v1/animals/{animal_id}")
+        # Single-flight: concurrent requests for the same id share one in-flight GET
+        task = self._inflight.get(animal_id)
+        if task is None or task not in self._waiters:  # absent, or cancelled by its last waiter
+            task = asyncio.ensure_future(self._fetch_animal(animal_id))
+            self._inflight[animal_id] = task
+            self._waiters[task] = 0
+            task.add_done_callback(functools.partial(self._forget, animal_id))
+        self._waiters[task] += 1
+        try:
+            # Shielded: a cancelled waiter must not cancel the fetch the other waiters share
+            return await asyncio.shield(task)
+        finally:
+            left = self._waiters.pop(task) - 1
+            if left:
+                self._waiters[task] = left
+            elif not task.done():
+                task.cancel()  # last waiter gone: nobody is left to use the result
+
+    def _forget(self, animal_id: int, task: asyncio.Future) -> None:
+        # A newer fetch may already own the slot if this one was cancelled by its last waiter
+        if self._inflight.get(animal_id) is task:
+            del self._inflight[animal_id]
+
+    async def _fetch_animal(self, animal_id: int) -> Dict[str, Any]:
+        path = f"/animals/v1/animals/{animal_id}"
+        # sqlite I/O runs off the event loop so cache lookups never stall the other workers
+        cached = await asyncio.to_thread(self.cache.get, path) if self.cache is not None else None
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        resp = await self._request("GET", path, headers=headers)
+        if resp.status_code == 304 and cached:
+            body = cached[1]
+        else:
+            body = resp.content
+            etag = resp.headers.get("ETag")
+            if self.cache is not None and etag:
+                await asyncio.to_thread(self.cache.put, path, etag, body)
         try:
-            return resp.json()
+            return orjson.loads(body)
         except ValueError:
-            print(f"[warn] non-JSON response for id {animal_id}: {resp.text[:200]}", file=sys.stderr)
+            log.warning("[warn] non-JSON response for id %s: %s", animal_id, resp.text[:200])
             return {}
 
     async def post_home(self, animals: List[Dict[str, Any]]) -> Dict[str, Any]:
-        resp = await self._request("POST", "/animals/v1/home", json=animals)
+        resp = await self._request(
+            "POST", "/animals/v1/home",
+            content=orjson.dumps(animals),
+            headers={"Content-Type": "application/json"},
+        )
         try:
-            return resp.json()
+            return orjson.loads(resp.content)
         except ValueError:
             return {}
         
 # ------------------ Pipeline ------------------
 
-def chunked(seq: List[Any], size: int):
-    """Yield successive chunks from seq of length <= size."""
-    for i in range(0, len(seq), size):
-        yield seq[i:i+size]
-
 async def fetch_all_ids(api: AsyncETL) -> List[int]:
     """
     Walk through paginated /animals/v1/animals, return list of IDs.
-    Starts with page 1 to get total_pages, then fetches the rest sequentially.
+    Starts with page 1 to get total_pages, then fetches the rest concurrently.
     """
     first = await api.get_animals_page(1)
     total_pages = int(first.get("total_pages", 1))
     ids = [int(item["id"]) for item in first.get("items", [])]
     
-    for p in range(2, total_pages + 1):
-        page = await api.get_animals_page(p)
+    async def fetch_page(p: int) -> Dict[str, Any]:
+        async with api.sem:
+            return await api.get_animals_page(p)
+    
+    pages = await asyncio.gather(*(fetch_page(p) for p in range(2, total_pages + 1)))
+    for page in pages:
         ids.extend(int(item["id"]) for item in page.get("items", []))
     return ids
 
-async def fetch_details_concurrent(api: AsyncETL, ids: List[int]) -> List[Dict[str, Any]]:
-    """
-    Fetch details concurrently for all IDs, bounded by semaphore.
-    Logs progress every 100 records.
-    """
-    async def worker(_id: int) -> Optional[Dict[str, Any]]:
-        async with api.sem:
-            try:
-                return await api.get_animal(_id)
-            except Exception as e:
-                print(f"[warn] get_animal({_id}) failed: {e}", file=sys.stderr)
-                return None
-
-    tasks = [asyncio.create_task(worker(_id)) for _id in ids]
-    results: List[Dict[str, Any]] = []
-    done = 0
-    for fut in asyncio.as_completed(tasks):
-        res = await fut
-        if res is not None:
-            results.append(res)
-        done += 1
-        if done % 100 == 0 or done == len(ids):
-            print(f"Fetched {done}/{len(ids)} details…")
-    return results
-
 def transform_records(details: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Transform raw records:
         • normalize friends → list[str]
         • convert born_at → ISO8601 UTC
-    Skips invalid/future timestamps and asserts all outgoing dates are valid.
+    Omits born_at for invalid/future timestamps; the converter only ever emits
+    the ISO8601-Z format, so outgoing dates are not re-validated.
     """
     transformed: List[Dict[str, Any]] = []
-    invalid_born = 0
-    for a in details:
-        born_iso = epoch_to_iso8601_utc(a.get("born_at")) if a.get("born_at") is not None else None
-        
-        if born_iso is not None and not validate_iso8601_utc(born_iso):
-            born_iso = None
-            invalid_born += 1
-        
+    born_column = epoch_to_iso8601_utc_batch([a.get("born_at") for a in details])
+    for a, born_iso in zip(details, born_column):
         outgoing = {
             "id": int(a["id"]),
             "name": a["name"],
@@ -316,33 +517,85 @@ def transform_records(details: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if born_iso is not None:
             outgoing["born_at"] = born_iso
         transformed.append(outgoing)
-    if invalid_born:
-        print(f"[warn] Skipped {invalid_born} invalid born_at values after conversion.", file=sys.stderr)
-    
-    assert all(validate_iso8601_utc(r.get("born_at")) for r in transformed), "Non-UTC ISO8601 detected in outgoing payload"
     return transformed
 
-async def post_batches(api: AsyncETL, transformed: List[Dict[str, Any]], batch_size: int):
+_DONE = object()  # end-of-stream sentinel for the pipeline queues
+
+async def stream_etl(api: AsyncETL, ids: List[int], batch_size: int, post_concurrency: int = 8) -> int:
     """
-    Upload records to /home in batches (≤100).
-    Logs batch counts and progress.
+    Overlap extract → transform → load through bounded queues:
+        • `api.concurrency` workers GET details into `details_q`
+        • one transformer groups them into batches (≤100) on `batch_q`
+        • `post_concurrency` uploaders POST batches as they arrive
+    Memory is bounded by queue depth instead of the total number of records.
+    Returns the number of records posted.
     """
     batch_size = max(1, min(100, batch_size))
-    batches = list(chunked(transformed, batch_size))
-    print(f"Uploading {len(batches)} batch(es)…")
-    for i, batch in enumerate(batches, 1):
-        await api.post_home(batch)
-        print(f"Posted batch {i}/{len(batches)} ({len(batch)} records).")
+    details_q: asyncio.Queue = asyncio.Queue(maxsize=200)
+    batch_q: asyncio.Queue = asyncio.Queue(maxsize=16)
+    pending_ids = iter(ids)
+    fetched = posted = n_batches = 0
+    
+    async def extractor() -> None:
+        nonlocal fetched
+        # Workers share one iterator, so each id is fetched exactly once
+        for _id in pending_ids:
+            try:
+                detail = await api.get_animal(_id)
+            except Exception as e:
+                log.warning("[warn] get_animal(%s) failed: %s", _id, e)
+                detail = None
+            fetched += 1
+            if fetched % 100 == 0 or fetched == len(ids):
+                log.info("Fetched %d/%d details…", fetched, len(ids))
+            if detail is not None:
+                await details_q.put(detail)
+    
+    async def extract() -> None:
+        await asyncio.gather(*(extractor() for _ in range(api.concurrency)))
+        await details_q.put(_DONE)
+    
+    async def transform() -> None:
+        pending: List[Dict[str, Any]] = []
+        while (detail := await details_q.get()) is not _DONE:
+            pending.append(detail)
+            if len(pending) == batch_size:
+                await batch_q.put(transform_records(pending))
+                pending = []
+        if pending:
+            await batch_q.put(transform_records(pending))
+        for _ in range(post_concurrency):
+            await batch_q.put(_DONE)
+    
+    async def uploader() -> None:
+        nonlocal posted, n_batches
+        while (batch := await batch_q.get()) is not _DONE:
+            await api.post_home(batch)
+            posted += len(batch)
+            n_batches += 1
+            log.debug("Posted batch %d (%d records, %d total).", n_batches, len(batch), posted)
+    
+    post_concurrency = max(1, post_concurrency)
+    tasks = [
+        asyncio.create_task(extract()),
+        asyncio.create_task(transform()),
+        *(asyncio.create_task(uploader()) for _ in range(post_concurrency)),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # A failed stage would leave the others blocked on their queues
+        for t in tasks:
+            t.cancel()
+    return posted
 
 async def run(args):
     """
     Orchestrate ETL:
         1. Extract IDs
-        2. Extract details concurrently
-        3. Transform records
-        4. Load batches
+        2. Stream details → transform → load batches (overlapped)
     """
-    print(f"""
+    log.info(f"""
         ====== Animals ETL (async) ======
         Base URL       : {args.base_url}
         Concurrency    : {args.concurrency}
@@ -357,28 +610,39 @@ async def run(args):
         read_timeout=args.read_timeout,
         retries=args.retries,
         concurrency=args.concurrency,
+        cache_path=args.cache_path,
     ) as api:
-        print("Listing IDs…")
+        await api.warm_up(min(api.concurrency, 8))
+        log.info("Listing IDs…")
         ids = await fetch_all_ids(api)
-        print(f"Found {len(ids)} ids.")
-
-        print("Fetching details concurrently…")
-        details = await fetch_details_concurrent(api, ids)
+        log.info("Found %d ids.", len(ids))
 
-        print("Transforming…")
-        transformed = transform_records(details)
+        log.info("Fetching, transforming and loading…")
+        posted = await stream_etl(api, ids, args.batch_size)
 
-        print("Loading…")
-        await post_batches(api, transformed, args.batch_size)
+    log.info("ETL Completed (%d records posted).", posted)
 
-    print("ETL Completed.")
+def _run(coro):
+    """
+    asyncio.run on uvloop's libuv event loop when it is installed; stdlib asyncio otherwise (e.g. Windows).
+    3.12+ passes a loop_factory (uvloop.install() is deprecated there); older versions install the policy.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 12):
+        return asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+    uvloop.install()
+    return asyncio.run(coro)
 
 def main():
     args = parse_args()
+    _configure_logging(args.log_level)
     try:
-        asyncio.run(run(args))
+        _run(run(args))
     except KeyboardInterrupt:
-        print("Aborted.", file=sys.stderr)
+        log.warning("Aborted.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
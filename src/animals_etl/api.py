@@ -7,13 +7,15 @@ Provides a typed interface for:
 - Posting transformed animal batches to "home" (`post_home`)
 
 All methods return typed dicts from `models.py` and handle non-JSON responses
-gracefully with stderr warnings.
+gracefully with stderr warnings (via `log_queue.log`). JSON is encoded/decoded with `orjson`.
 """
 from __future__ import annotations
-import sys
 from typing import Any, Dict
 
+import orjson
+
 from http_client import HttpClient
+from log_queue import log
 
 from .models import AnimalRaw, AnimalDetail, AnimalsBatch
 
@@ -25,22 +27,26 @@ class AnimalsAPI:
     async def list_animals(self, page: int) -> AnimalRaw:
         resp = await self.http.request("GET", "/animals/v1/animals", params={"page": page})
         try:
-            return resp.json()
+            return orjson.loads(resp.content)
         except ValueError:
-            print(f"[warn] Non-JSON for page {page}", file=sys.stderr)
+            log(f"[warn] Non-JSON for page {page}")
             return {"items": [], "total_pages": 1, "page": page}
 
     async def get_animal(self, animal_id: int) -> AnimalDetail:
         resp = await self.http.request("GET", f"/animals/v1/animals/{animal_id}")
         try:
-            return resp.json()
+            return orjson.loads(resp.content)
         except ValueError:
-            print(f"[warn] non-JSON response for id {animal_id}: {resp.text[:200]}", file=sys.stderr)
+            log(f"[warn] non-JSON response for id {animal_id}: {resp.text[:200]}")
             return {}
 
     async def post_home(self, batch: AnimalsBatch) -> Dict[str, Any]:
-        resp = await self.http.request("POST", "/animals/v1/home", json=batch)
+        resp = await self.http.request(
+            "POST", "/animals/v1/home",
+            content=orjson.dumps(batch),
+            headers={"Content-Type": "application/json"},
+        )
         try:
-            return resp.json()
+            return orjson.loads(resp.content)
         except ValueError:
             return {}
@@ -3,29 +3,35 @@ Command-line entrypoint for the Animals ETL pipeline.
 
 - Parses CLI args and config
 - Initializes HttpClient and AnimalsAPI
-- Orchestrates pipeline steps:
+- Runs the streaming pipeline (`run_etl`), where these steps overlap:
     1. Fetch all animal IDs (with limited page concurrency)
     2. Fetch details concurrently
     3. Transform records
     4. Post transformed batches
 
+Warnings/retry lines are batched to stderr by a single `LogDrainer` task.
 Handles validation errors (422) and KeyboardInterrupt cleanly for user experience.
 """
 from __future__ import annotations
 import asyncio, sys
 
 from http_client import HttpClient, ValidationHTTPError
+from log_queue import LogDrainer
 
 from .api import AnimalsAPI
 from .config import parse_args
-from .pipeline import fetch_all_ids, fetch_details_concurrent, transform_records, post_batches
+from .pipeline import run_etl
 
 async def run(args):
-    async with HttpClient(
+    page_concurrency = max(2, args.concurrency // 2)
+    post_concurrency = 4
+    async with LogDrainer(), HttpClient(
         base_url=args.base_url,
         connect_timeout=args.connect_timeout,
         read_timeout=args.read_timeout,
         retries=args.retries,
+        # One connection per request run_etl can have in flight: detail workers + page fetchers + uploaders
+        max_connections=args.concurrency + page_concurrency + post_concurrency,
     ) as http:
         api = AnimalsAPI(http)
         print(f"""
@@ -37,15 +43,27 @@ async def run(args):
             Timeouts (s)   : connect={args.connect_timeout} read={args.read_timeout}
             ===============================
         """)
-        ids = await fetch_all_ids(api, min(3, max(1, args.concurrency // 2)))
-        details = await fetch_details_concurrent(api, ids, args.concurrency)
-        transformed = transform_records(details)
-        await post_batches(api, transformed, args.batch_size)
+        await http.warm_up("/animals/v1/animals", min(args.concurrency, 8), params={"page": 1})
+        await run_etl(api, args.concurrency, args.batch_size, page_concurrency, post_concurrency)
+
+def _run(coro):
+    """
+    asyncio.run on uvloop's libuv event loop when it is installed; stdlib asyncio otherwise (e.g. Windows).
+    3.12+ passes a loop_factory (uvloop.install() is deprecated there); older versions install the policy.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 12):
+        return asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+    uvloop.install()
+    return asyncio.run(coro)
 
 def main() -> None:
     args = parse_args()
     try:
-        asyncio.run(run(args))
+        _run(run(args))
     except ValidationHTTPError as e:
         print(f"Validation error: {e.detail}", file=sys.stderr)
         sys.exit(2)
@@ -1,9 +1,10 @@
 from __future__ import annotations
-import sys, asyncio
+import asyncio, time
 from typing import List, Optional
+from log_queue import log
 from .api import AnimalsAPI
-from .models import AnimalRaw, AnimalDetail, AnimalsBatch
-from .utils import chunked, split_friends, epoch_to_iso8601_utc, validate_iso8601_utc
+from .models import AnimalRaw, AnimalDetail, AnimalTransformed, AnimalsBatch
+from .utils import chunked, split_friends, epoch_to_iso8601_utc, epoch_to_iso8601_utc_batch
 
 async def fetch_all_ids(api: AnimalsAPI, page_concurrency: int = 6) -> List[int]:
     """
@@ -16,84 +17,184 @@ async def fetch_all_ids(api: AnimalsAPI, page_concurrency: int = 6) -> List[int]
     if total_pages <= 1:
         return ids
 
-    sem = asyncio.Semaphore(max(1, page_concurrency))
+    sem = asyncio.Semaphore(max(1, min(page_concurrency, total_pages - 1)))
 
     async def fetch_page(p: int) -> List[int]:
         async with sem:
             page = await api.list_animals(p)
             return [int(item["id"]) for item in page.get("items", [])]
 
-    tasks = [asyncio.create_task(fetch_page(p)) for p in range(2, total_pages + 1)]
-    for fut in asyncio.as_completed(tasks):
-        ids.extend(await fut)
+    # Page order doesn't matter for IDs; gather avoids as_completed's per-yield wait set
+    for page_ids in await asyncio.gather(*(fetch_page(p) for p in range(2, total_pages + 1))):
+        ids.extend(page_ids)
     return ids
 
 async def fetch_details_concurrent(api: AnimalsAPI, ids: List[int], concurrency: int) -> List[AnimalDetail]:
     """
     Fetch details concurrently for all IDs, bounded by semaphore.
-    Logs progress every 100 records.
+    Each worker writes its own slot of a preallocated list, so output keeps input order.
+    A background ticker logs progress once per second instead of per result.
     """
     sem = asyncio.Semaphore(max(1, concurrency))
-    async def worker(_id: int) -> Optional[AnimalDetail]:
+    results: List[Optional[AnimalDetail]] = [None] * len(ids)
+    done = 0
+
+    async def worker(i: int, _id: int) -> None:
+        nonlocal done
         async with sem:
             try:
-                return await api.get_animal(_id)
+                results[i] = await api.get_animal(_id)
             except Exception as e:
-                print(f"[warn] get_animal({_id}) failed: {e}", file=sys.stderr)
-                return None
+                log(f"[warn] get_animal({_id}) failed: {e}")
+            finally:
+                done += 1
 
-    tasks = [asyncio.create_task(worker(_id)) for _id in ids]
-    results: List[AnimalDetail] = []
-    done = 0
-    for fut in asyncio.as_completed(tasks):
-        res = await fut
-        if res is not None:
-            results.append(res)
-        done += 1
-        if done % 100 == 0 or done == len(ids):
+    async def ticker() -> None:
+        while True:
+            await asyncio.sleep(1.0)
             print(f"Fetched {done}/{len(ids)} details…")
-    return results
+
+    progress = asyncio.create_task(ticker())
+    try:
+        await asyncio.gather(*(worker(i, _id) for i, _id in enumerate(ids)), return_exceptions=True)
+    finally:
+        progress.cancel()
+    print(f"Fetched {done}/{len(ids)} details…")
+    return [r for r in results if r is not None]
+
+def _build_record(a: AnimalDetail, born_iso: Optional[str]) -> AnimalTransformed:
+    rec: AnimalTransformed = {
+        "id": int(a["id"]),
+        "name": a["name"],
+        "friends": split_friends(a.get("friends", "")),
+    }
+
+    if born_iso is not None:
+        rec["born_at"] = born_iso
+    return rec
+
+def transform_record(a: AnimalDetail, now_ts: float) -> AnimalTransformed:
+    """Transform one detail record; born_at is omitted when invalid or in the future."""
+    return _build_record(a, epoch_to_iso8601_utc(a.get("born_at"), now_ts))
 
 def transform_records(details: List[AnimalDetail]) -> AnimalsBatch:
     """
     Transform raw records:
         • normalize friends → list[str]
-        • convert born_at → ISO8601 UTC
-    Skips invalid/future timestamps and asserts all outgoing dates are valid.
+        • convert born_at → ISO8601 UTC (whole column at once)
+    Omits born_at for invalid/future timestamps. Output format is guaranteed by
+    `epoch_to_iso8601_utc` (covered by unit tests), so it is not re-validated here.
     """
-    transformed: AnimalsBatch = []
-    invalid_born = 0
-    for a in details:
-        born_iso = epoch_to_iso8601_utc(a.get("born_at")) if a.get("born_at") is not None else None
-        if born_iso is not None and not validate_iso8601_utc(born_iso):
-            born_iso = None
-            invalid_born += 1
-        
-        rec = {
-            "id": int(a["id"]),
-            "name": a["name"],
-            "friends": split_friends(a.get("friends", "")),
-        }
-        
-        if born_iso is not None:
-            rec["born_at"] = born_iso
-        transformed.append(rec)
-    
-    if invalid_born:
-        print(f"[warn] Skipped {invalid_born} invalid born_at values after conversion.", file=sys.stderr)
-    
-    assert all(validate_iso8601_utc(r.get("born_at")) for r in transformed), "Non-UTC ISO8601 detected in outgoing payload"
-    return transformed
-
-async def post_batches(api: AnimalsAPI, transformed: AnimalsBatch, batch_size: int):
+    born_column = epoch_to_iso8601_utc_batch([a.get("born_at") for a in details], time.time())
+    return [_build_record(a, born_iso) for a, born_iso in zip(details, born_column)]
+
+async def post_batches(api: AnimalsAPI, transformed: AnimalsBatch, batch_size: int, concurrency: int = 4):
     """
     Upload records to /home in batches (≤100).
+    Batches are independent, so up to `concurrency` POSTs are in flight at once.
     Logs batch counts and progress.
     """
     batch_size = max(1, min(100, batch_size))
     n_batches = (len(transformed) + batch_size - 1) // batch_size  # ceil division
+    sem = asyncio.Semaphore(max(1, concurrency))
 
-    print(f"Uploading {n_batches} batch(es)…")
-    for i, batch in enumerate(chunked(transformed, batch_size), start=1):
-        await api.post_home(batch)
+    async def post_one(i: int, batch: AnimalsBatch) -> None:
+        async with sem:
+            await api.post_home(batch)
         print(f"Posted batch {i}/{n_batches} ({len(batch)} records).")
+
+    print(f"Uploading {n_batches} batch(es)…")
+    await asyncio.gather(*(post_one(i, batch) for i, batch in enumerate(chunked(transformed, batch_size), start=1)))
+
+_DONE = object()  # end-of-stream sentinel for run_etl's queues
+
+async def run_etl(api: AnimalsAPI, concurrency: int, batch_size: int, page_concurrency: int = 6,
+                  post_concurrency: int = 4) -> int:
+    """
+    Streaming ETL where page listing, detail fetches, transforms and POSTs overlap:
+        • a page producer pushes IDs onto `id_q` as each page arrives
+        • `concurrency` workers fetch + transform details onto `rec_q`
+        • a batcher groups every `batch_size` (≤100) records, then the remainder, onto `batch_q`
+        • `post_concurrency` uploaders POST batches as they arrive
+    Wall-clock tends to the slowest stage rather than the sum of all of them.
+    Returns the number of records posted.
+    """
+    concurrency = max(1, concurrency)
+    post_concurrency = max(1, post_concurrency)
+    batch_size = max(1, min(100, batch_size))
+    id_q: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+    rec_q: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 2)
+    batch_q: asyncio.Queue = asyncio.Queue(maxsize=post_concurrency * 2)
+    now_ts = time.time()
+    fetched = posted = 0
+
+    async def produce_ids() -> None:
+        async def enqueue(page: AnimalRaw) -> None:
+            for item in page.get("items", []):
+                await id_q.put(int(item["id"]))
+
+        first: AnimalRaw = await api.list_animals(1)
+        total_pages = int(first.get("total_pages", 1))
+        await enqueue(first)
+
+        sem = asyncio.Semaphore(max(1, min(page_concurrency, total_pages - 1)))
+
+        async def fetch_page(p: int) -> None:
+            async with sem:
+                page = await api.list_animals(p)
+            await enqueue(page)
+
+        await asyncio.gather(*(fetch_page(p) for p in range(2, total_pages + 1)))
+        for _ in range(concurrency):
+            await id_q.put(_DONE)
+
+    async def detail_worker() -> None:
+        nonlocal fetched
+        while (animal_id := await id_q.get()) is not _DONE:
+            try:
+                detail = await api.get_animal(animal_id)
+            except Exception as e:
+                log(f"[warn] get_animal({animal_id}) failed: {e}")
+                continue
+            await rec_q.put(transform_record(detail, now_ts))
+            fetched += 1
+            if fetched % 100 == 0:
+                print(f"Fetched {fetched} details…")
+
+    async def fetch_details() -> None:
+        await asyncio.gather(*(detail_worker() for _ in range(concurrency)))
+        await rec_q.put(_DONE)
+
+    async def batcher() -> None:
+        batch: AnimalsBatch = []
+        while (rec := await rec_q.get()) is not _DONE:
+            batch.append(rec)
+            if len(batch) == batch_size:
+                await batch_q.put(batch)
+                batch = []
+        if batch:
+            await batch_q.put(batch)
+        for _ in range(post_concurrency):
+            await batch_q.put(_DONE)
+
+    async def uploader() -> None:
+        nonlocal posted
+        while (batch := await batch_q.get()) is not _DONE:
+            await api.post_home(batch)
+            posted += len(batch)
+            print(f"Posted batch ({len(batch)} records, {posted} total).")
+
+    tasks = [
+        asyncio.create_task(produce_ids()),
+        asyncio.create_task(fetch_details()),
+        asyncio.create_task(batcher()),
+        *(asyncio.create_task(uploader()) for _ in range(post_concurrency)),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # A failed stage would leave the others blocked on their queues
+        for t in tasks:
+            t.cancel()
+    print(f"Fetched {fetched} details, posted {posted} records.")
+    return posted
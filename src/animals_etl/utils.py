@@ -1,10 +1,19 @@
 from __future__ import annotations
-from datetime import datetime, timezone
-from typing import Any, List, Iterable, Optional
-import re
+from typing import Any, List, Iterable, Optional, Tuple
+import re, time
+from functools import lru_cache
 
 RETRY_STATUSES = {500, 502, 503, 504}
 ISO_UTC_Z_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z$")
+# SWAR template for the 20-byte "YYYY-MM-DDTHH:MM:SSZ" shape, read as one little-endian int:
+# separator lanes must equal the template, digit lanes must fall in b"0".."9"
+_ISO_TPL = b"0000-00-00T00:00:00Z"
+_ISO_SEP_MASK = int.from_bytes(bytes(0 if c == 0x30 else 0xFF for c in _ISO_TPL), "little")
+_ISO_SEP_EXPECT = int.from_bytes(_ISO_TPL, "little") & _ISO_SEP_MASK
+_ISO_DIGIT_MASK = int.from_bytes(bytes(0xFF if c == 0x30 else 0 for c in _ISO_TPL), "little")
+_ISO_LANE_30 = int.from_bytes(bytes(0x30 if c == 0x30 else 0 for c in _ISO_TPL), "little")
+_ISO_LANE_46 = int.from_bytes(bytes(0x46 if c == 0x30 else 0 for c in _ISO_TPL), "little")
+_ISO_LANE_HI = int.from_bytes(bytes(0x80 if c == 0x30 else 0 for c in _ISO_TPL), "little")
 
 def chunked(seq: List[Any], size: int) -> Iterable[List[Any]]:
     """Yield successive chunks from seq of length <= size."""
@@ -15,40 +24,117 @@ def split_friends(s: Optional[str]) -> List[str]:
     """Split a comma-delimited string into a trimmed list; tolerates None/empty."""
     if not s:
         return []
-    return [p.strip() for p in s.split(",") if p.strip()]
+    # str.split + strip beats a regex scan for a fixed one-char delimiter; empty entries are dropped
+    return [t for part in s.split(",") if (t := part.strip())]
 
-def epoch_to_iso8601_utc(epoch: Optional[int | float]) -> Optional[str]:
+# Divisor that brings each unit (s, ms, µs, ns) to seconds, indexed by the bit-length bucket
+_UNIT_DIVISORS = (1, 1_000, 1_000_000, 1_000_000_000)
+# Same buckets precomputed per bit length: s < 2**36 (~6.9e10) <= ms < 2**46 (~7.0e13) <= µs < 2**53 (~9.0e15) <= ns
+_DIV_BY_BITS = tuple(_UNIT_DIVISORS[(n > 36) + (n > 46) + (n > 53)] for n in range(128))
+
+@lru_cache(maxsize=4096)
+def _civil_date(days: int) -> str:
+    """Days since 1970-01-01 -> "YYYY-MM-DDT" (Hinnant's civil_from_days, pure integer math)."""
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097                                          # [0, 146096]
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365    # [0, 399]
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)                    # [0, 365], March-based
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    mo = mp + 3 if mp < 10 else mp - 9
+    return f"{yoe + era * 400 + (mo <= 2):04d}-{mo:02d}-{d:02d}T"
+
+@lru_cache(maxsize=4096)
+def _fmt(sec: int) -> str:
+    """UTC epoch seconds -> "YYYY-MM-DDTHH:MM:SS"; timestamps cluster, so formatted once per distinct second."""
+    days, rem = divmod(sec, 86400)
+    hh, rem = divmod(rem, 3600)
+    mm, ss = divmod(rem, 60)
+    return f"{_civil_date(days)}{hh:02d}:{mm:02d}:{ss:02d}"
+
+def _format_utc(sec: int, micros: int = 0) -> str:
+    """Format whole UTC epoch seconds (+ optional microseconds) as ISO8601 with 'Z'."""
+    base = _fmt(sec)
+    return f"{base}.{micros:06d}Z" if micros else f"{base}Z"
+
+@lru_cache(maxsize=1 << 15)
+def _epoch_int_to_iso(e: int) -> Tuple[float, Optional[str]]:
+    """
+    Memoized core of `epoch_to_iso8601_utc` for non-negative integer epochs.
+    Returns (seconds since epoch, ISO string or None if unrepresentable).
+    """
+    # Detect units by magnitude with one table lookup (anything past 127 bits is ns anyway)
+    n = e.bit_length()
+    div = _DIV_BY_BITS[n] if n < 128 else 1_000_000_000
+
+    if div == 1_000_000_000:
+        # ns -> µs rounded half-to-even, as datetime.fromtimestamp does, but exact (no float noise)
+        us, rem = divmod(e, 1_000)
+        if rem > 500 or (rem == 500 and us & 1):
+            us += 1
+        sec, micros = divmod(us, 1_000_000)
+    else:
+        sec, frac = divmod(e, div)
+        micros = frac * 1_000_000 // div  # exact for s/ms/µs
+    try:
+        return e / div, _format_utc(sec, micros)
+    except (OverflowError, OSError, ValueError):
+        return e / div, None
+
+def epoch_to_iso8601_utc(epoch: Optional[int | float], now_ts: Optional[float] = None) -> Optional[str]:
     """
     Convert epoch to ISO8601 UTC with 'Z'.
     Auto-detect unit (s/ms/µs/ns) by magnitude.
     Returns None for invalid, negative, or future timestamps.
+    Pass `now_ts` (a `time.time()` value) once per batch to avoid reading the clock per record.
     """
     # Reject negatives and null
     if epoch is None or epoch < 0:
         return None
-    
-    e = int(epoch)
-    now = datetime.now(tz=timezone.utc)
-
-    # Detect units by magnitude
-    if e >= 10**18:          # nanoseconds
-        ts = e / 1_000_000_000.0
-    elif e >= 10**15:        # microseconds
-        ts = e / 1_000_000.0
-    elif e >= 10**12:        # milliseconds
-        ts = e / 1_000.0
-    else:                    # seconds
-        ts = float(e)
-    try:
-        dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-    except (OverflowError, OSError, ValueError):
-        return None
-    
-    # Guardrail: keep only dates until present
-    return dt.isoformat().replace("+00:00", "Z") if dt <= now else None
+
+    ts, iso = _epoch_int_to_iso(int(epoch))
+
+    # Guardrail: keep only dates until present (checked outside the cache)
+    if now_ts is None:
+        now_ts = time.time()
+    return iso if ts <= now_ts else None
+
+def epoch_to_iso8601_utc_batch(epochs: Iterable[Optional[int | float]], now_ts: Optional[float] = None) -> List[Optional[str]]:
+    """
+    Column-wise `epoch_to_iso8601_utc`: convert a whole born_at column in one pass.
+    Reads the clock once and binds the memoized core locally, so each row is a cache
+    lookup plus one float compare.
+    """
+    if now_ts is None:
+        now_ts = time.time()
+    convert = _epoch_int_to_iso
+    out: List[Optional[str]] = []
+    append = out.append
+    for epoch in epochs:
+        if epoch is None or epoch < 0:
+            append(None)
+            continue
+        ts, iso = convert(int(epoch))
+        append(iso if ts <= now_ts else None)
+    return out
 
 def validate_iso8601_utc(z: Optional[str]) -> bool:
     """True iff string is ISO8601 UTC with 'Z' suffix (None allowed)."""
     if z is None:
         return True
-    return bool(ISO_UTC_Z_RE.match(z))
+    if len(z) == 20:
+        # Whole-second shape: one SWAR pass over the bytes instead of the regex engine
+        if not z.isascii():
+            return False
+        w = int.from_bytes(z.encode("ascii"), "little")
+        if w & _ISO_SEP_MASK != _ISO_SEP_EXPECT:
+            return False
+        d = w & _ISO_DIGIT_MASK
+        # A lane < 0x30 borrows and a lane > 0x39 carries into its high bit
+        return ((d - _ISO_LANE_30) | (d + _ISO_LANE_46)) & _ISO_LANE_HI == 0
+    # Fractional seconds: every separator must be in place before the regex runs
+    if (len(z) < 22 or z[-1] != "Z" or z[19] != "." or z[10] != "T"
+            or z[4] != "-" or z[7] != "-" or z[13] != ":" or z[16] != ":"):
+        return False
+    return ISO_UTC_Z_RE.fullmatch(z) is not None
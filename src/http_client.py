@@ -3,19 +3,28 @@ Reusable async HTTP client with retry and error handling.
 
 Components:
 - ValidationHTTPError: raised on 422 with parsed validation details
-- RetryPolicy: exponential backoff + jitter, configurable retries/status codes
+- RetryPolicy: full-jitter exponential backoff, configurable retries/status codes
 - HttpClient: async context manager wrapping httpx.AsyncClient
   - Adds base_url, default headers, and X-Request-Id
   - Retries transient 5xx and network errors
   - Fails fast on 4xx
   - Special handling for 422 validation errors
+  - warm_up(): pre-opens pooled connections before a request burst
 
 Used across the ETL pipeline for robust API communication.
 """
 from __future__ import annotations
-import sys, asyncio, random, uuid
+import asyncio, itertools, os, random
 from typing import Optional
 import httpx
+import orjson
+
+from log_queue import log
+
+_rng = random.Random()  # dedicated backoff RNG, independent of the global random state
+# X-Request-Id = "<pid>-<seq>" (hex): unique within a run, distinguishable across processes
+_PID_TAG = f"{os.getpid():x}"
+_REQ_COUNTER = itertools.count()
 
 class ValidationHTTPError(Exception):
     """Raised on 422 responses with parsed validation details."""
@@ -40,14 +49,16 @@ class RetryPolicy:
         self.retry_statuses = retry_statuses or {500, 502, 503, 504}
 
     def sleep_seconds(self, attempt: int) -> float:
-        # exponential (0.5, 1, 2, 4, 8...) + jitter [0..0.5]
-        return min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1))) + random.uniform(0, 0.5)
+        # full jitter: uniform over [0, exponential window (base, 2*base, 4*base... capped)]
+        return _rng.uniform(0, min(self.backoff_cap, self.backoff_base * (1 << (attempt - 1))))
 
 class HttpClient:
     """
     - Reusable async HTTP client with:
       - base_url
       - httpx timeouts
+      - pooled keep-alive connections (max_connections)
+      - HTTP/2 multiplexing when the server negotiates it (https + ALPN)
       - retry policy (5xx + network)
       - 4xx fail fast
     """
@@ -61,6 +72,8 @@ class HttpClient:
         *,
         retry_statuses: Optional[set[int]] = None,
         default_headers: Optional[dict[str, str]] = None,
+        max_connections: int = 32,
+        http2: bool = True,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = httpx.Timeout(
@@ -70,17 +83,39 @@ class HttpClient:
             pool=read_timeout,
         )
         self.policy = RetryPolicy(retries=retries, retry_statuses=retry_statuses)
-        self.default_headers = {"Accept": "application/json", **(default_headers or {})}
+        self.default_headers = {"Accept": "application/json", "Connection": "keep-alive", **(default_headers or {})}
+        # Keep every pooled connection alive so detail GETs reuse sockets instead of re-handshaking
+        self.limits = httpx.Limits(
+            max_connections=max(1, max_connections),
+            max_keepalive_connections=max(1, max_connections),
+        )
+        self.http2 = http2
         self._client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self):
-        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, headers=self.default_headers)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            headers=self.default_headers,
+            limits=self.limits,
+            http2=self.http2,
+        )
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
         if self._client is not None:
             await self._client.aclose()
 
+    async def warm_up(self, path: str, n: int, **kwargs) -> None:
+        """
+        Best-effort: open up to `n` pooled connections with concurrent GETs before a burst,
+        so the first wave reuses sockets instead of racing to handshake. No retries; errors ignored.
+        Each GET is capped at the connect timeout: a slow body must not hold up start-up.
+        """
+        assert self._client is not None
+        kwargs.setdefault("timeout", self.timeout.connect)
+        await asyncio.gather(*(self._client.get(path, **kwargs) for _ in range(max(0, n))), return_exceptions=True)
+
     async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
         """
         Generic request with retry logic.
@@ -90,7 +125,7 @@ class HttpClient:
         assert self._client is not None
         last_exc: Exception | None = None
 
-        req_id = kwargs.pop("req_id", str(uuid.uuid4()))
+        req_id = kwargs.pop("req_id", None) or f"{_PID_TAG}-{next(_REQ_COUNTER):x}"
         headers = kwargs.pop("headers", {})
         headers.setdefault("X-Request-Id", req_id)
         kwargs["headers"] = headers
@@ -109,11 +144,11 @@ class HttpClient:
                 # 422 (validation) handling: log useful details, then fail fast
                 if status == 422:
                     try:
-                        payload = resp.json()
+                        payload = orjson.loads(resp.content)
                     except ValueError:
                         payload = {"detail": (resp.text or "Unprocessable Entity")}
                     detail = payload.get("detail", payload)
-                    print(f"[req#{req_id}] 422 validation error on {method} {url}: {detail}", file=sys.stderr)
+                    log(f"[req#{req_id}] 422 validation error on {method} {url}: {detail}")
                     raise ValidationHTTPError(detail, method=method, path=path)
 
                 # Fail fast, don’t retry
@@ -123,17 +158,17 @@ class HttpClient:
                 # Defensive: no other non-2xx should slip through
                 if not (200 <= status < 300):
                     if 500 <= status < 600 and status not in self.policy.retry_statuses:
-                        print(f"[req#{req_id}] [fatal] {method} {url} returned {status}, not retrying", file=sys.stderr)
+                        log(f"[req#{req_id}] [fatal] {method} {url} returned {status}, not retrying")
                     resp.raise_for_status()
 
                 if attempt > 1:
-                    print(f"[req#{req_id}] succeeded after {attempt} attempt(s)", file=sys.stderr)
+                    log(f"[req#{req_id}] succeeded after {attempt} attempt(s)")
                 return resp
 
             except httpx.HTTPStatusError as e:
                 status = getattr(e.response, "status_code", None)
                 if status is not None and 400 <= status < 500:
-                    print(f"[req#{req_id}] [fatal] {method} {url} returned {status}, not retrying", file=sys.stderr)
+                    log(f"[req#{req_id}] [fatal] {method} {url} returned {status}, not retrying")
                     raise
                 last_exc = e
 
@@ -143,15 +178,15 @@ class HttpClient:
             if attempt < self.policy.retries:
                 sleep = self.policy.sleep_seconds(attempt)
                 params = kwargs.get("params")
-                has_json = kwargs.get("json") is not None
+                has_json = kwargs.get("json") is not None or kwargs.get("content") is not None
                 err_kind = f"HTTP {getattr(getattr(last_exc, 'response', None), 'status_code', 'ERR')}" \
                         if isinstance(last_exc, httpx.HTTPStatusError) else "network"
-                print(f"[req#{req_id}] [retry {attempt}/{self.policy.retries}] {method} {url} "
+                log(f"[req#{req_id}] [retry {attempt}/{self.policy.retries}] {method} {url} "
                     f"params={params} json={has_json} failed: {err_kind}: {last_exc}. "
-                    f"Sleeping {sleep:.2f}s", file=sys.stderr)
+                    f"Sleeping {sleep:.2f}s")
                 await asyncio.sleep(sleep)
             else:
-                print(f"[req#{req_id}] [giving up] {method} {url}: {last_exc}", file=sys.stderr)
+                log(f"[req#{req_id}] [giving up] {method} {url}: {last_exc}")
                 raise last_exc or RuntimeError("request failed")
 
         raise last_exc or RuntimeError("request failed")
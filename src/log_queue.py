@@ -0,0 +1,81 @@
+"""
+Batched stderr logging for concurrent async workers.
+
+Components:
+- log(msg): non-blocking; queues the line while a drainer is running, otherwise
+  writes it straight to stderr (sync callers, tests)
+- LogDrainer: async context manager owning the queue and a single drainer task
+  - Flushes up to `max_lines` messages (or whatever arrived within `interval`)
+    with one `write` call, so workers never contend on the stderr lock
+  - Drains everything still queued on exit
+
+Used by HttpClient (retry/giving-up lines) and the pipeline warnings.
+"""
+from __future__ import annotations
+import sys, asyncio
+from typing import Optional
+
+_queue: Optional[asyncio.Queue[str]] = None
+
+def log(msg: str) -> None:
+    """Emit one stderr line without blocking the calling task."""
+    if _queue is None:
+        print(msg, file=sys.stderr)
+    else:
+        _queue.put_nowait(msg)
+
+def _write(lines: list[str]) -> None:
+    data = "".join(f"{line}\n" for line in lines)
+    buf = getattr(sys.stderr, "buffer", None)
+    if buf is None:  # replaced/captured stderr without a byte layer
+        sys.stderr.write(data)
+        sys.stderr.flush()
+        return
+    sys.stderr.flush()  # keep ordering with anything printed through the text layer
+    buf.write(data.encode("utf-8", "replace"))
+    buf.flush()
+
+class LogDrainer:
+    """
+    - Routes `log()` through an asyncio.Queue for the lifetime of the context
+    - One background task batches ≤max_lines messages or `interval` seconds per write
+    """
+
+    def __init__(self, max_lines: int = 64, interval: float = 0.1):
+        self.max_lines = max(1, max_lines)
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "LogDrainer":
+        global _queue
+        _queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._drain(_queue))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        global _queue
+        q, _queue = _queue, None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        rest = []
+        while q is not None and not q.empty():
+            rest.append(q.get_nowait())
+        if rest:
+            _write(rest)
+
+    async def _drain(self, q: asyncio.Queue[str]) -> None:
+        while True:
+            lines = [await q.get()]
+            if q.qsize() < self.max_lines - 1:
+                try:
+                    await asyncio.sleep(self.interval)  # let a burst accumulate
+                except asyncio.CancelledError:
+                    _write(lines)
+                    raise
+            while len(lines) < self.max_lines and not q.empty():
+                lines.append(q.get_nowait())
+            _write(lines)
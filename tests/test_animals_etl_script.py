@@ -0,0 +1,149 @@
+import asyncio
+import importlib.util
+import pathlib
+import httpx
+import orjson
+import pytest
+
+_SCRIPT = pathlib.Path(__file__).resolve().parents[1] / "scripts" / "animals_etl.py"
+
+@pytest.fixture(scope="module")
+def etl():
+    spec = importlib.util.spec_from_file_location("animals_etl_script", _SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_api(etl, **kwargs):
+    return etl.AsyncETL(base_url="http://where_the_animals_at", connect_timeout=1, read_timeout=1,
+                        retries=2, concurrency=4, **kwargs)
+
+@pytest.mark.asyncio
+async def test_get_animal_single_flight_dedups_and_cleans_up(etl):
+    api = make_api(etl)
+    calls = []
+    release = asyncio.Event()
+
+    async def fake_fetch(animal_id):
+        calls.append(animal_id)
+        await release.wait()
+        return {"id": animal_id}
+
+    api._fetch_animal = fake_fetch
+    waiters = [asyncio.create_task(api.get_animal(7)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert list(api._inflight) == [7]
+
+    release.set()
+    assert await asyncio.gather(*waiters) == [{"id": 7}] * 3
+    assert calls == [7]
+    assert api._inflight == {}
+
+@pytest.mark.asyncio
+async def test_get_animal_cancelled_waiter_does_not_cancel_shared_fetch(etl):
+    api = make_api(etl)
+    release = asyncio.Event()
+
+    async def fake_fetch(animal_id):
+        await release.wait()
+        return {"id": animal_id}
+
+    api._fetch_animal = fake_fetch
+    first = asyncio.create_task(api.get_animal(1))
+    second = asyncio.create_task(api.get_animal(1))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == {"id": 1}
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    await asyncio.sleep(0)
+    assert api._inflight == {}
+
+@pytest.mark.asyncio
+async def test_get_animal_cancelling_last_waiter_cancels_fetch(etl):
+    api = make_api(etl)
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def fake_fetch(animal_id):
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    api._fetch_animal = fake_fetch
+    only = asyncio.create_task(api.get_animal(3))
+    await started.wait()
+
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert api._inflight == {} and api._waiters == {}
+
+@pytest.mark.asyncio
+async def test_exit_cancels_fetches_before_closing_cache(etl, tmp_path):
+    api = make_api(etl, cache_path=str(tmp_path / "etag.sqlite"))
+    started = asyncio.Event()
+
+    async def fake_fetch(animal_id):
+        started.set()
+        await asyncio.Event().wait()
+
+    api._fetch_animal = fake_fetch
+    async with api:
+        waiter = asyncio.create_task(api.get_animal(4))
+        await started.wait()
+    # The shared fetch was cancelled and awaited by __aexit__, so its waiter sees the cancellation
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(waiter, 1)
+    assert api._inflight == {}
+
+@pytest.fixture
+def cached_api(etl, tmp_path):
+    api = make_api(etl)
+    api.cache = etl.ETagCache(str(tmp_path / "etag.sqlite"))
+    yield api
+    api.cache.close()
+
+def mock_client(handler):
+    return httpx.AsyncClient(base_url="http://where_the_animals_at", transport=httpx.MockTransport(handler))
+
+@pytest.mark.asyncio
+async def test_etag_200_stores_body_and_304_serves_it(cached_api):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"id": 5, "name": "Dog"}, headers={"ETag": '"v1"'})
+
+    cached_api.client = mock_client(handler)
+    async with cached_api.client:
+        assert await cached_api.get_animal(5) == {"id": 5, "name": "Dog"}
+        etag, body = cached_api.cache.get("/animals/v1/animals/5")
+        assert etag == '"v1"' and orjson.loads(body) == {"id": 5, "name": "Dog"}
+
+        assert await cached_api.get_animal(5) == {"id": 5, "name": "Dog"}
+    assert seen == [None, '"v1"']
+
+@pytest.mark.asyncio
+async def test_response_without_etag_is_not_cached(cached_api):
+    cached_api.client = mock_client(lambda request: httpx.Response(200, json={"id": 6, "name": "Cat"}))
+    async with cached_api.client:
+        assert await cached_api.get_animal(6) == {"id": 6, "name": "Cat"}
+    assert cached_api.cache.get("/animals/v1/animals/6") is None
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 0.0), ("2", 2.0), ("-3", 0.0), ("soon", 0.0), ("inf", 0.0), ("nan", 0.0), ("86400", 32.0),
+])
+def test_retry_after_is_bounded(etl, value, expected):
+    headers = {} if value is None else {"Retry-After": value}
+    assert etl._retry_after_seconds(httpx.Response(503, headers=headers)) == expected
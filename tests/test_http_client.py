@@ -24,6 +24,9 @@ class FakeAsyncClient:
         resp = self._responses.pop(0)
         return resp
 
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
     async def aclose(self):
         pass
 
@@ -44,4 +47,20 @@ async def test_http_client_retries_then_succeeds(monkeypatch):
         hc._client = fake
         resp = await hc.request("GET", "/bow")
         assert resp.status_code == 200
-        assert resp.json() == {"ok": 1}
\ No newline at end of file
+        assert resp.json() == {"ok": 1}
+
+@pytest.mark.asyncio
+async def test_warm_up_is_best_effort():
+    hc = HttpClient(base_url="http://where_the_animals_at", connect_timeout=1, read_timeout=1, retries=3)
+    fake = FakeAsyncClient([FakeResponse(200), FakeResponse(503)])  # third call raises
+
+    async with hc:
+        hc._client = fake
+        await hc.warm_up("/meow", 3)
+        assert fake.calls == 3
+
+def test_retry_policy_full_jitter_stays_within_window():
+    policy = RetryPolicy(retries=6, backoff_base=0.25, backoff_cap=4.0)
+    for attempt in range(1, 8):
+        window = min(4.0, 0.25 * (2 ** (attempt - 1)))
+        assert all(0 <= policy.sleep_seconds(attempt) <= window for _ in range(50))
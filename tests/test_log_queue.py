@@ -0,0 +1,16 @@
+import asyncio
+import pytest
+from log_queue import LogDrainer, log
+
+@pytest.mark.asyncio
+async def test_drainer_batches_and_flushes_all_lines_in_order(capsys):
+    async with LogDrainer(max_lines=8, interval=0.01):
+        for i in range(20):
+            log(f"line {i}")
+        await asyncio.sleep(0)  # some lines may still be queued at exit
+    err = capsys.readouterr().err
+    assert err.splitlines() == [f"line {i}" for i in range(20)]
+
+def test_log_without_drainer_writes_directly(capsys):
+    log("direct")
+    assert capsys.readouterr().err == "direct\n"
@@ -1,5 +1,7 @@
+import asyncio
 import pytest
-from animals_etl.pipeline import fetch_all_ids, fetch_details_concurrent, transform_records, post_batches
+from animals_etl.utils import validate_iso8601_utc
+from animals_etl.pipeline import fetch_all_ids, fetch_details_concurrent, transform_records, post_batches, run_etl
 
 class FakeAPI:
     def __init__(self, pages, details):
@@ -37,7 +39,7 @@ async def test_fetch_ids_and_details_and_transform_and_post_batches():
 
     # Fetch details concurrently
     dd = await fetch_details_concurrent(api, ids, concurrency=4)
-    assert {d["id"] for d in dd} == {1, 2, 3}
+    assert [d["id"] for d in dd] == ids  # input order preserved
 
     # Transform
     transformed = transform_records(dd)
@@ -53,3 +55,46 @@ async def test_fetch_ids_and_details_and_transform_and_post_batches():
     assert len(api.posted) == 2           # 2 batches (2 + 1)
     assert api.posted[0][0]["id"] == 1
     assert sum(len(b) for b in api.posted) == 3
+
+def test_transform_records_born_at_invariant():
+    # Runtime code trusts epoch_to_iso8601_utc; the output-format invariant is checked here instead
+    epochs = [None, -5, 0, 1348692957, 1348692957651, 1348692957651123, 1348692957651123456, 4102444800000]
+    details = [{"id": i, "name": f"A{i}", "friends": "", "born_at": e} for i, e in enumerate(epochs)]
+    transformed = transform_records(details)
+    assert all(validate_iso8601_utc(r.get("born_at")) for r in transformed)
+    assert [("born_at" in r) for r in transformed] == [False, False, True, True, True, True, True, False]
+
+@pytest.mark.asyncio
+async def test_run_etl_streams_all_records_in_batches():
+    pages = {p: [{"id": i, "name": f"A{i}"} for i in range(p * 10 - 9, p * 10 + 1)] for p in (1, 2, 3)}
+    details = {i: {"id": i, "name": f"A{i}", "friends": "Dog, Cat", "born_at": 1348692957651} for i in range(1, 31)}
+    api = FakeAPI(pages, details)
+
+    posted = await run_etl(api, concurrency=4, batch_size=7)
+
+    assert posted == 30
+    assert sorted(len(b) for b in api.posted) == [2, 7, 7, 7, 7]
+    records = [r for b in api.posted for r in b]
+    assert sorted(r["id"] for r in records) == list(range(1, 31))
+    assert all(r["friends"] == ["Dog", "Cat"] and r["born_at"].endswith("Z") for r in records)
+
+@pytest.mark.asyncio
+async def test_run_etl_posts_batches_concurrently():
+    pages = {1: [{"id": i, "name": f"A{i}"} for i in range(1, 41)]}
+    details = {i: {"id": i, "name": f"A{i}", "friends": "", "born_at": None} for i in range(1, 41)}
+
+    class SlowPostAPI(FakeAPI):
+        in_flight = peak = 0
+
+        async def post_home(self, batch):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.02)
+            self.in_flight -= 1
+            return await super().post_home(batch)
+
+    api = SlowPostAPI(pages, details)
+    posted = await run_etl(api, concurrency=8, batch_size=5, post_concurrency=4)
+
+    assert posted == 40
+    assert api.peak > 1
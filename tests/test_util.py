@@ -1,10 +1,16 @@
-from animals_etl.utils import split_friends, epoch_to_iso8601_utc, validate_iso8601_utc
+import time
+from animals_etl.utils import split_friends, epoch_to_iso8601_utc, epoch_to_iso8601_utc_batch, validate_iso8601_utc
 from datetime import datetime, timezone
+import pytest
+
+_GOOD = ("2020-01-01T00:00:00Z", "1999-12-31T23:59:59.123Z")
+_BAD = ("2020-01-01T00:00:00+00:00", "2020-01-01")
 
 def test_split_friends_basic():
     assert split_friends("Dog, Kangaroo, Sea Lions") == ["Dog", "Kangaroo", "Sea Lions"]
     assert split_friends("") == []
     assert split_friends(None) == []
+    assert split_friends(" Dog ,,\tCat , ") == ["Dog", "Cat"]
 
 def test_epoch_conversions():
     # seconds
@@ -16,9 +22,60 @@ def test_epoch_conversions():
     # nanoseconds
     assert epoch_to_iso8601_utc(1_577_836_800_000_000_000) == "2020-01-01T00:00:00Z"
 
-def test_validate_iso():
-    good = ["2020-01-01T00:00:00Z", "1999-12-31T23:59:59.123Z"]
-    bad = ["2020-01-01T00:00:00+00:00", "2020-01-01", None]
-    assert all(validate_iso8601_utc(s) for s in good)
-    # None is allowed (field omitted), so test only non-Nones
-    assert all(not validate_iso8601_utc(s) for s in bad if s is not None)
+@pytest.mark.parametrize("s", _GOOD)
+def test_validate_iso_accepts(s):
+    assert validate_iso8601_utc(s)
+
+@pytest.mark.parametrize("s", _BAD)
+def test_validate_iso_rejects(s):
+    assert not validate_iso8601_utc(s)
+
+def test_validate_iso_allows_none():
+    # None is allowed (field omitted)
+    assert validate_iso8601_utc(None)
+
+def test_validate_perf(benchmark):
+    # Tracked by pytest-benchmark (compare runs with --benchmark-compare); no fixed time bound
+    results = benchmark(lambda: [validate_iso8601_utc(s) for s in _GOOD * 1000])
+    assert all(results)
+
+def test_epoch_ns_rounds_to_nearest_microsecond():
+    # Sub-microsecond ns digits round half-to-even (datetime.fromtimestamp semantics); µs is exact
+    assert epoch_to_iso8601_utc(1_577_836_800_999_999_999) == "2020-01-01T00:00:01Z"
+    assert epoch_to_iso8601_utc(1_577_836_800_000_001_499) == "2020-01-01T00:00:00.000001Z"
+    assert epoch_to_iso8601_utc(1_577_836_800_000_001_500) == "2020-01-01T00:00:00.000002Z"
+    assert epoch_to_iso8601_utc(1_577_836_800_000_002_500) == "2020-01-01T00:00:00.000002Z"
+    assert epoch_to_iso8601_utc(1_577_836_800_999_999) == "2020-01-01T00:00:00.999999Z"
+
+def test_epoch_subsecond_and_future():
+    now_ts = datetime(2021, 1, 1, tzinfo=timezone.utc).timestamp()
+    assert epoch_to_iso8601_utc(1_348_692_957_651, now_ts) == "2012-09-26T20:55:57.651000Z"
+    assert epoch_to_iso8601_utc(1_609_459_201, now_ts) is None
+    assert epoch_to_iso8601_utc(-1, now_ts) is None
+
+def test_epoch_unit_detection_before_2001():
+    # 1990-01-01 in every unit; ms/µs/ns values this small used to be read as a coarser unit
+    for epoch in (631_152_000, 631_152_000_000, 631_152_000_000_000, 631_152_000_000_000_000):
+        assert epoch_to_iso8601_utc(epoch) == "1990-01-01T00:00:00Z"
+
+def test_epoch_formatting_matches_gmtime():
+    # Leap days, century rules and year boundaries for the integer civil-date path
+    for sec in (0, 951_782_400, 951_868_800, 1_078_012_800, 4_107_542_399, 4_107_542_400, 32_503_680_000):
+        t = time.gmtime(sec)
+        assert epoch_to_iso8601_utc(sec, now_ts=float("inf")) == time.strftime("%Y-%m-%dT%H:%M:%SZ", t)
+
+def test_epoch_batch_matches_scalar():
+    now_ts = datetime(2021, 1, 1, tzinfo=timezone.utc).timestamp()
+    column = [None, -1, 0, 1_348_692_957, 1_348_692_957_651, 1_348_692_957_651_123,
+              1_348_692_957_651_123_456, 1_609_459_201, 1_348_692_957_651]
+    assert epoch_to_iso8601_utc_batch(column, now_ts) == [epoch_to_iso8601_utc(e, now_ts) for e in column]
+    assert epoch_to_iso8601_utc_batch([]) == []
+
+def test_epoch_output_is_valid_iso():
+    for epoch in (0, 1_348_692_957_651, 1_577_836_800_000_001, 1_577_836_800_123_456_789):
+        assert validate_iso8601_utc(epoch_to_iso8601_utc(epoch))
+
+def test_validate_iso_rejects_malformed_shapes():
+    for s in ("abcd-ef-ghTij:kl:mnZ", "2020-01-01T00:00:00Z\n", "2020-01-01 00:00:00Z", "2020-01-01T00:00:00.Z",
+              "2020-01-01T00:00:0aZ", "2020/01-01T00:00:00Z", "/020-01-01T00:00:00Z", "2020-01-01T00:00:0\u0660Z"):
+        assert not validate_iso8601_utc(s)